@@ -5,9 +5,13 @@ import subprocess
 import tempfile
 import urllib.request
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 
+_COPY_CHUNK_SIZE = 1 << 20
+
+
 def _load_cidrs(url: str) -> list[str]:
     with urllib.request.urlopen(url) as response:
         content = response.read().decode("utf-8")
@@ -21,20 +25,44 @@ def _load_cidrs(url: str) -> list[str]:
 
 
 def _download_zip(url: str, dest: Path) -> Path:
-    with urllib.request.urlopen(url) as response:
-        data = response.read()
     zip_path = dest / "archive.zip"
-    zip_path.write_bytes(data)
-    with zipfile.ZipFile(zip_path, "r") as zf:
-        zf.extractall(dest)
-    return dest
+    with urllib.request.urlopen(url) as response, zip_path.open("wb") as fh:
+        shutil.copyfileobj(response, fh, length=_COPY_CHUNK_SIZE)
+    return zip_path
+
+
+def _find_member_dir(names: list[str], suffix: str) -> str:
+    for name in names:
+        index = name.find("/")
+        while index != -1:
+            if name[:index].endswith(suffix):
+                return name[: index + 1]
+            index = name.find("/", index + 1)
+    raise SystemExit(f"Directory not found: {suffix}")
 
 
-def _find_dir(root: Path, suffix: str) -> Path:
-    for path in root.rglob("*"):
-        if path.is_dir() and path.as_posix().endswith(suffix):
-            return path
-    raise SystemExit(f"Directory not found: {suffix}")
+def _member_target(dest: Path, name: str) -> Path:
+    root = dest.resolve()
+    target = (root / name).resolve()
+    if not target.is_relative_to(root):
+        raise SystemExit(f"Zip member escapes extraction dir: {name}")
+    return target
+
+
+def _extract_dirs(zip_path: Path, dest: Path, *suffixes: str) -> list[Path]:
+    with zipfile.ZipFile(zip_path, "r") as zf:
+        names = zf.namelist()
+        prefixes = [_find_member_dir(names, suffix) for suffix in suffixes]
+        for prefix in prefixes:
+            _member_target(dest, prefix).mkdir(parents=True, exist_ok=True)
+        for info in zf.infolist():
+            if info.is_dir() or not info.filename.startswith(tuple(prefixes)):
+                continue
+            target = _member_target(dest, info.filename)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            with zf.open(info) as src, target.open("wb") as dst:
+                shutil.copyfileobj(src, dst, length=_COPY_CHUNK_SIZE)
+    return [dest / prefix for prefix in prefixes]
 
 
 def _resolve_private_src() -> Path:
@@ -52,62 +80,46 @@ def _run_build_geoip(private_src: Path, *args: str) -> None:
     )
 
 
-def _build_cn(output_path: Path, url: str, private_src: Path) -> None:
-    temp_dir = Path(tempfile.mkdtemp())
-    try:
-        cidrs = _load_cidrs(url)
-        if not cidrs:
-            raise SystemExit("No CIDR data found")
-        input_dir = temp_dir / "text"
-        input_dir.mkdir(parents=True, exist_ok=True)
-        (input_dir / "CN.txt").write_text("\n".join(cidrs) + "\n", encoding="utf-8")
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        _run_build_geoip(
-            private_src,
-            "--input-dir",
-            str(input_dir),
-            "--output-dat",
-            str(output_path),
-        )
-    finally:
-        shutil.rmtree(temp_dir)
-
-
-def _build_geoip_text(output_path: Path, zip_url: str, private_src: Path) -> None:
-    temp_dir = Path(tempfile.mkdtemp())
-    try:
-        _download_zip(zip_url, temp_dir)
-        text_dir = _find_dir(temp_dir, "text")
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        _run_build_geoip(
-            private_src,
-            "--input-dir",
-            str(text_dir),
-            "--output-dat",
-            str(output_path),
-        )
-    finally:
-        shutil.rmtree(temp_dir)
-
-
-def _build_iana(output_path: Path, zip_url: str, private_src: Path) -> None:
-    temp_dir = Path(tempfile.mkdtemp())
-    try:
-        _download_zip(zip_url, temp_dir)
-        ipv4_dir = _find_dir(temp_dir, "TXT/IPV4")
-        ipv6_dir = _find_dir(temp_dir, "TXT/IPV6")
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        _run_build_geoip(
-            private_src,
-            "--ipv4-dir",
-            str(ipv4_dir),
-            "--ipv6-dir",
-            str(ipv6_dir),
-            "--output-dat",
-            str(output_path),
-        )
-    finally:
-        shutil.rmtree(temp_dir)
+def _build_cn(output_path: Path, cidrs: list[str], work_dir: Path, private_src: Path) -> None:
+    if not cidrs:
+        raise SystemExit("No CIDR data found")
+    input_dir = work_dir / "text"
+    input_dir.mkdir(parents=True, exist_ok=True)
+    (input_dir / "CN.txt").write_text("\n".join(cidrs) + "\n", encoding="utf-8")
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    _run_build_geoip(
+        private_src,
+        "--input-dir",
+        str(input_dir),
+        "--output-dat",
+        str(output_path),
+    )
+
+
+def _build_geoip_text(output_path: Path, zip_path: Path, private_src: Path) -> None:
+    (text_dir,) = _extract_dirs(zip_path, zip_path.parent, "text")
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    _run_build_geoip(
+        private_src,
+        "--input-dir",
+        str(text_dir),
+        "--output-dat",
+        str(output_path),
+    )
+
+
+def _build_iana(output_path: Path, zip_path: Path, private_src: Path) -> None:
+    ipv4_dir, ipv6_dir = _extract_dirs(zip_path, zip_path.parent, "TXT/IPV4", "TXT/IPV6")
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    _run_build_geoip(
+        private_src,
+        "--ipv4-dir",
+        str(ipv4_dir),
+        "--ipv6-dir",
+        str(ipv6_dir),
+        "--output-dat",
+        str(output_path),
+    )
 
 
 def main() -> None:
@@ -121,9 +133,22 @@ def main() -> None:
     args = parser.parse_args()
     private_src = _resolve_private_src()
 
-    _build_cn(Path(args.out_cn), args.cn_url, private_src)
-    _build_geoip_text(Path(args.out_geoip), args.geoip_zip_url, private_src)
-    _build_iana(Path(args.out_iana), args.iana_zip_url, private_src)
+    with tempfile.TemporaryDirectory() as temp_dir_name:
+        temp_dir = Path(temp_dir_name)
+        cn_dir = temp_dir / "cn"
+        geoip_dir = temp_dir / "geoip"
+        iana_dir = temp_dir / "iana"
+        for work_dir in (cn_dir, geoip_dir, iana_dir):
+            work_dir.mkdir()
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            cidrs_future = executor.submit(_load_cidrs, args.cn_url)
+            geoip_future = executor.submit(_download_zip, args.geoip_zip_url, geoip_dir)
+            iana_future = executor.submit(_download_zip, args.iana_zip_url, iana_dir)
+
+            _build_cn(Path(args.out_cn), cidrs_future.result(), cn_dir, private_src)
+            _build_geoip_text(Path(args.out_geoip), geoip_future.result(), private_src)
+            _build_iana(Path(args.out_iana), iana_future.result(), private_src)
 
 
 if __name__ == "__main__":
@@ -1,16 +1,26 @@
 import os
+import re
 import shutil
 import subprocess
 import sys
 import tempfile
 import zipfile
-from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path, PurePosixPath
+
+from setuptools import build_meta
+
+
+_COPY_CHUNK_SIZE = 1 << 20
+_VERSION_RE = re.compile(r'^version\s*=\s*"([^"]+)"')
 
 
 def _read_version(cargo_toml: Path) -> str:
-    for line in cargo_toml.read_text(encoding="utf-8").splitlines():
-        if line.strip().startswith("version"):
-            return line.split("=", 1)[1].strip().strip('"')
+    with cargo_toml.open("r", encoding="utf-8") as fh:
+        for line in fh:
+            match = _VERSION_RE.match(line.strip())
+            if match:
+                return match.group(1)
     raise SystemExit("Version not found in Cargo.toml")
 
 
@@ -21,6 +31,82 @@ def _load_setup_template(template_path: Path, version: str) -> str:
     return template.replace("__VERSION__", version)
 
 
+def _build_wheel(source_dir: Path, wheel_dir: Path) -> Path:
+    previous_cwd = Path.cwd()
+    os.chdir(source_dir)
+    try:
+        wheel_name = build_meta.build_wheel(
+            str(wheel_dir),
+            config_settings={"--build-option": ["--py-limited-api=cp310"]},
+        )
+    finally:
+        os.chdir(previous_cwd)
+    return wheel_dir / wheel_name
+
+
+def _repack_one(
+    wheel: Path,
+    public_version: str,
+    setup_py: str,
+    package_src: Path,
+    readme_src: Path,
+    license_src: Path,
+    staging_dir: Path,
+) -> list[str]:
+    with tempfile.TemporaryDirectory() as temp_dir_name:
+        temp_dir = Path(temp_dir_name)
+        assembly_dir = temp_dir / "assembly"
+        assembly_dir.mkdir()
+
+        package_dir = assembly_dir / "poptrie"
+        shutil.copytree(package_src, package_dir, dirs_exist_ok=True)
+
+        suffixes = (".so", ".pyd", ".dll", ".dylib")
+        native_found = False
+        with zipfile.ZipFile(wheel, "r") as archive:
+            for info in archive.infolist():
+                member = PurePosixPath(info.filename)
+                if info.is_dir() or not member.name.startswith("_native") or member.suffix not in suffixes:
+                    continue
+                with archive.open(info) as src, (package_dir / member.name).open("wb") as dst:
+                    shutil.copyfileobj(src, dst, length=_COPY_CHUNK_SIZE)
+                native_found = True
+        if not native_found:
+            raise SystemExit(f"native module not found in {wheel.name}")
+
+        shutil.copy2(readme_src, assembly_dir / "README.md")
+        shutil.copy2(license_src, assembly_dir / "LICENSE")
+        (assembly_dir / "setup.py").write_text(setup_py, encoding="utf-8")
+
+        wheel.unlink()
+        built_wheels = [_build_wheel(assembly_dir, assembly_dir / "dist")]
+        if sys.platform.startswith("linux"):
+            wheelhouse = assembly_dir / "wheelhouse"
+            wheelhouse.mkdir(exist_ok=True)
+            for built_wheel in built_wheels:
+                subprocess.run(
+                    [
+                        sys.executable,
+                        "-m",
+                        "auditwheel",
+                        "repair",
+                        str(built_wheel),
+                        "-w",
+                        str(wheelhouse),
+                    ],
+                    cwd=assembly_dir,
+                    check=True,
+                )
+            built_wheels = sorted(wheelhouse.glob("*.whl"))
+            if not built_wheels:
+                raise SystemExit("auditwheel did not produce a wheel")
+        for built_wheel in built_wheels:
+            if public_version not in built_wheel.name:
+                raise SystemExit(f"Repacked wheel version mismatch for {wheel.name}")
+            shutil.copy2(built_wheel, staging_dir / built_wheel.name)
+        return [built_wheel.name for built_wheel in built_wheels]
+
+
 def main() -> None:
     repo_root = Path(os.environ.get("GITHUB_WORKSPACE", Path.cwd())).resolve()
     private_root = Path(os.environ["POPTRIE_PRIVATE_SRC"]).resolve()
@@ -49,68 +135,40 @@ def main() -> None:
     if not wheels:
         raise SystemExit("No wheels found in dist")
 
-    for wheel in wheels:
-        with tempfile.TemporaryDirectory() as temp_dir_name:
-            temp_dir = Path(temp_dir_name)
-            source_extract_dir = temp_dir / "source"
-            assembly_dir = temp_dir / "assembly"
-            source_extract_dir.mkdir()
-            assembly_dir.mkdir()
-
-            with zipfile.ZipFile(wheel, "r") as archive:
-                archive.extractall(source_extract_dir)
-
-            package_dir = assembly_dir / "poptrie"
-            shutil.copytree(package_src, package_dir, dirs_exist_ok=True)
-
-            suffixes = (".so", ".pyd", ".dll", ".dylib")
-            native_files = []
-            for ext_file in source_extract_dir.rglob("*"):
-                if ext_file.is_file() and ext_file.name.startswith("_native") and ext_file.suffix in suffixes:
-                    native_files.append(ext_file)
-            if not native_files:
-                raise SystemExit(f"native module not found in {wheel.name}")
-            for native_file in native_files:
-                shutil.copy2(native_file, package_dir / native_file.name)
-
-            shutil.copy2(readme_src, assembly_dir / "README.md")
-            shutil.copy2(license_src, assembly_dir / "LICENSE")
-            (assembly_dir / "setup.py").write_text(setup_py, encoding="utf-8")
-
-            wheel.unlink()
-            subprocess.run(
-                [sys.executable, "setup.py", "bdist_wheel", "--py-limited-api=cp310"],
-                cwd=assembly_dir,
-                check=True,
-            )
-
-            built_wheels = sorted((assembly_dir / "dist").glob("*.whl"))
-            if not built_wheels:
-                raise SystemExit("bdist_wheel did not produce a wheel")
-            if sys.platform.startswith("linux"):
-                wheelhouse = assembly_dir / "wheelhouse"
-                wheelhouse.mkdir(exist_ok=True)
-                for built_wheel in built_wheels:
-                    subprocess.run(
-                        [
-                            sys.executable,
-                            "-m",
-                            "auditwheel",
-                            "repair",
-                            str(built_wheel),
-                            "-w",
-                            str(wheelhouse),
-                        ],
-                        cwd=assembly_dir,
-                        check=True,
+    # Workers stage their output separately; publishing happens here, in
+    # sorted input order, so wheels that repack to the same name resolve to
+    # the last input deterministically and never race on the same file.
+    with tempfile.TemporaryDirectory(dir=dist_dir) as staging_root_name:
+        staging_root = Path(staging_root_name)
+        staging_dirs = [staging_root / str(index) for index in range(len(wheels))]
+        with ProcessPoolExecutor(max_workers=min(len(wheels), os.cpu_count() or 1)) as executor:
+            futures = []
+            for wheel, staging_dir in zip(wheels, staging_dirs):
+                staging_dir.mkdir()
+                futures.append(
+                    executor.submit(
+                        _repack_one,
+                        wheel,
+                        public_version,
+                        setup_py,
+                        package_src,
+                        readme_src,
+                        license_src,
+                        staging_dir,
                     )
-                built_wheels = sorted(wheelhouse.glob("*.whl"))
-                if not built_wheels:
-                    raise SystemExit("auditwheel did not produce a wheel")
-            for built_wheel in built_wheels:
-                if public_version not in built_wheel.name:
-                    raise SystemExit(f"Repacked wheel version mismatch for {wheel.name}")
-                shutil.copy2(built_wheel, dist_dir / built_wheel.name)
+                )
+            built_names = [future.result() for future in futures]
+
+        published: dict[str, str] = {}
+        for wheel, staging_dir, names in zip(wheels, staging_dirs, built_names):
+            for name in names:
+                if name in published:
+                    print(
+                        f"{wheel.name} repacks to {name}, replacing the build from {published[name]}",
+                        file=sys.stderr,
+                    )
+                os.replace(staging_dir / name, dist_dir / name)
+                published[name] = wheel.name
 
 
 if __name__ == "__main__":
@@ -2,8 +2,36 @@ from __future__ import annotations
 
 import itertools
 import socket
+import weakref
+from types import MappingProxyType
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Union
+from typing import Any, ClassVar, Iterable, List, Mapping, Optional, Tuple, Union
+
+
+_inet_pton = socket.inet_pton
+_AF_INET = socket.AF_INET
+_AF_INET6 = socket.AF_INET6
+
+IpInput = Union[str, bytes, bytearray, memoryview]
+
+
+def _build_country_table() -> Tuple[Optional[str], ...]:
+    """Build the A-Z two-letter country table indexed by u16 code."""
+
+    table: List[Optional[str]] = [None] * 0x10000
+    for first, second in itertools.product(range(65, 91), range(65, 91)):
+        table[(first << 8) | second] = chr(first) + chr(second)
+    return tuple(table)
+
+
+_COUNTRY_TABLE = _build_country_table()
+_COUNTRY_MAP: Mapping[int, str] = MappingProxyType(
+    {code: country for code, country in enumerate(_COUNTRY_TABLE) if country is not None}
+)
+
+_SEARCHER_CACHE: weakref.WeakValueDictionary[Tuple[str, int, int], _NativeHandle] = (
+    weakref.WeakValueDictionary()
+)
 
 
 class PoptrieError(Exception):
@@ -16,9 +44,34 @@ def _load_native_ip_searcher():
     return NativeIpSearcher
 
 
+class _NativeHandle:
+    """Weak-referenceable holder that lets facades share one native searcher."""
+
+    __slots__ = ("searcher", "__weakref__")
+
+    def __init__(self, searcher: Any) -> None:
+        self.searcher = searcher
+
+
+def _open_native_searcher(path: Path) -> _NativeHandle:
+    """Return a handle for `path`, shared while the file is unchanged."""
+
+    stat = path.stat()
+    key = (str(path.resolve()), stat.st_mtime_ns, stat.st_size)
+    handle = _SEARCHER_CACHE.get(key)
+    if handle is None:
+        NativeIpSearcher = _load_native_ip_searcher()
+        handle = _NativeHandle(NativeIpSearcher(str(path)))
+        _SEARCHER_CACHE[key] = handle
+    return handle
+
+
 class IpSearcher:
     """Semantic Python facade for the Rust-backed Poptrie searcher."""
 
+    _country_table: ClassVar[Tuple[Optional[str], ...]] = _COUNTRY_TABLE
+    _china_country_code: ClassVar[int] = (ord("C") << 8) | ord("N")
+
     def __init__(self, bin_path: Union[str, Path]) -> None:
         """Load a pre-built binary database file.
 
@@ -31,32 +84,18 @@ class IpSearcher:
             raise FileNotFoundError(f"Binary file not found: {self.path}")
 
         try:
-            NativeIpSearcher = _load_native_ip_searcher()
-            self._searcher = NativeIpSearcher(str(self.path))
+            self._handle = _open_native_searcher(self.path)
         except ImportError as exc:
             raise PoptrieError(f"Failed to import Poptrie native module: {exc}") from exc
         except Exception as exc:
             raise PoptrieError(f"Failed to load Poptrie database: {exc}") from exc
-
-        self._country_map: Optional[Dict[int, str]] = None
-        self._china_country_code = self._country_code_to_u16("CN")
+        self._searcher = self._handle.searcher
 
     @property
-    def country_map(self) -> Dict[int, str]:
-        """Return the lazy-built u16 -> country string map."""
-
-        if self._country_map is None:
-            self._country_map = self._build_country_map()
-        return self._country_map
+    def country_map(self) -> Mapping[int, str]:
+        """Return the read-only u16 -> country string map."""
 
-    @staticmethod
-    def _build_country_map() -> Dict[int, str]:
-        """Build the A-Z two-letter country lookup table."""
-
-        return {
-            (first << 8) | second: f"{chr(first)}{chr(second)}"
-            for first, second in itertools.product(range(65, 91), range(65, 91))
-        }
+        return _COUNTRY_MAP
 
     @staticmethod
     def _country_code_to_u16(country_code: str) -> int:
@@ -70,21 +109,29 @@ class IpSearcher:
     def _country_from_u16(self, country_code: int) -> Optional[str]:
         """Convert a u16 country code into its 2-letter string."""
 
-        return self.country_map.get(country_code) if country_code > 0 else None
+        return self._country_table[country_code] if 0 < country_code <= 0xFFFF else None
 
     @staticmethod
-    def _pack_ip(ip: str) -> bytes:
-        """Pack an IPv4 or IPv6 string into bytes."""
-
+    def _pack_ip(ip: IpInput) -> bytes:
+        """Pack an IPv4 or IPv6 string into bytes; packed input passes through."""
+
+        if isinstance(ip, (bytes, bytearray, memoryview)):
+            packed = bytes(ip)
+            if len(packed) not in (4, 16):
+                raise ValueError(f"Invalid packed IP length: {len(packed)}")
+            return packed
         try:
-            return socket.inet_pton(socket.AF_INET, ip)
-        except OSError:
-            try:
-                return socket.inet_pton(socket.AF_INET6, ip)
-            except OSError as exc:
-                raise ValueError(f"Invalid IP address format: {ip}") from exc
-
-    def __contains__(self, ip: str) -> bool:
+            return _inet_pton(_AF_INET6 if ":" in ip else _AF_INET, ip)
+        except OSError as exc:
+            raise ValueError(f"Invalid IP address format: {ip}") from exc
+
+    @staticmethod
+    def _as_list(ips: Iterable[str]) -> List[str]:
+        """Return `ips` as a list, reusing it when it already is one."""
+
+        return ips if isinstance(ips, list) else list(ips)
+
+    def __contains__(self, ip: IpInput) -> bool:
         """Support `ip in searcher` syntax."""
 
         try:
@@ -92,11 +139,11 @@ class IpSearcher:
         except ValueError:
             return False
 
-    def contains_ip(self, ip: str) -> bool:
+    def contains_ip(self, ip: IpInput) -> bool:
         """Check whether an IP exists in the database.
 
           Args:
-              ip: IPv4 or IPv6 string.
+              ip: IPv4 or IPv6 string, or its 4/16-byte packed form.
 
           Returns:
               True if the IP matches any prefix in the database.
@@ -104,11 +151,11 @@ class IpSearcher:
 
         return self._searcher.contains_ip(self._pack_ip(ip))
 
-    def lookup_country(self, ip: str) -> Optional[str]:
+    def lookup_country(self, ip: IpInput) -> Optional[str]:
         """Look up the country code for one IP.
 
         Args:
-            ip: IPv4 or IPv6 string.
+            ip: IPv4 or IPv6 string, or its 4/16-byte packed form.
 
         Returns:
             Two-letter country code or None if not matched.
@@ -116,11 +163,11 @@ class IpSearcher:
 
         return self._country_from_u16(self._searcher.lookup_country(self._pack_ip(ip)))
 
-    def matches_country(self, ip: str, country_code: str) -> bool:
+    def matches_country(self, ip: IpInput, country_code: str) -> bool:
         """Check whether an IP belongs to the given country.
 
          Args:
-             ip: IPv4 or IPv6 string.
+             ip: IPv4 or IPv6 string, or its 4/16-byte packed form.
              country_code: Two-letter ISO country code such as `CN`.
 
          Returns:
@@ -134,21 +181,24 @@ class IpSearcher:
     def contains_ips(self, ips: Iterable[str]) -> List[bool]:
         """Check whether multiple IPs exist in the database."""
 
-        return self._searcher.contains_strings(list(ips))
+        return self._searcher.contains_strings(self._as_list(ips))
 
     def lookup_countries(self, ips: Iterable[str]) -> List[Optional[str]]:
         """Look up country codes for multiple IP strings."""
 
-        return [
-            self._country_from_u16(country_code)
-            for country_code in self._searcher.lookup_countries_strings(list(ips))
-        ]
+        country_codes = self._searcher.lookup_countries_strings(self._as_list(ips))
+        return list(map(self._country_table.__getitem__, country_codes))
+
+    def lookup_country_codes(self, ips: Iterable[str]) -> List[int]:
+        """Look up raw u16 country codes for multiple IP strings (0 if not matched)."""
+
+        return self._searcher.lookup_countries_strings(self._as_list(ips))
 
     def matches_countries(self, ips: Iterable[str], country_code: str) -> List[bool]:
         """Check whether multiple IPs belong to the given country."""
 
         return self._searcher.matches_country_strings(
-            list(ips), self._country_code_to_u16(country_code)
+            self._as_list(ips), self._country_code_to_u16(country_code)
         )
 
     def contains_packed(self, packed_ips: bytes, is_v6: bool = False) -> List[bool]:
@@ -161,10 +211,13 @@ class IpSearcher:
     ) -> List[Optional[str]]:
         """Look up countries for packed IPv4 or IPv6 byte streams."""
 
-        return [
-            self._country_from_u16(country_code)
-            for country_code in self._searcher.lookup_countries_packed(packed_ips, is_v6)
-        ]
+        country_codes = self._searcher.lookup_countries_packed(packed_ips, is_v6)
+        return list(map(self._country_table.__getitem__, country_codes))
+
+    def lookup_country_codes_packed(self, packed_ips: bytes, is_v6: bool = False) -> List[int]:
+        """Look up raw u16 country codes for packed IPv4 or IPv6 byte streams."""
+
+        return self._searcher.lookup_countries_packed(packed_ips, is_v6)
 
     def matches_country_packed(
         self, packed_ips: bytes, country_code: str, is_v6: bool = False,
@@ -175,10 +228,10 @@ class IpSearcher:
             packed_ips, self._country_code_to_u16(country_code), is_v6
         )
 
-    def is_china(self, ip: str) -> bool:
+    def is_china(self, ip: IpInput) -> bool:
         """Shortcut for `matches_country(ip, "CN")`."""
 
-        return self.matches_country(ip, "CN")
+        return self._searcher.matches_country(self._pack_ip(ip), self._china_country_code)
 
 
 if __name__ == "__main__":
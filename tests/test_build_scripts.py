@@ -0,0 +1,69 @@
+import importlib
+import sys
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / ".github" / "scripts"
+
+
+class TestExtractDirs(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        sys.path.insert(0, str(SCRIPTS_DIR))
+        cls.modules = [
+            importlib.import_module("build_cn_bin"),
+            importlib.import_module("build_overlap_reports"),
+        ]
+
+    @classmethod
+    def tearDownClass(cls):
+        sys.path.remove(str(SCRIPTS_DIR))
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        self.dest = self.root / "dest"
+        self.dest.mkdir()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _write_zip(self, members):
+        zip_path = self.root / "archive.zip"
+        with zipfile.ZipFile(zip_path, "w") as zf:
+            for name, data in members.items():
+                zf.writestr(name, data)
+        return zip_path
+
+    def test_extracts_only_requested_dirs(self):
+        zip_path = self._write_zip({
+            "repo/TXT/IPV4/CN.txt": "1.0.1.0/24\n",
+            "repo/TXT/IPV6/CN.txt": "240e::/20\n",
+            "repo/other/skip.txt": "skip\n",
+        })
+        for module in self.modules:
+            with self.subTest(module=module.__name__):
+                ipv4_dir, ipv6_dir = module._extract_dirs(
+                    zip_path, self.dest, "TXT/IPV4", "TXT/IPV6"
+                )
+                self.assertEqual((ipv4_dir / "CN.txt").read_text(), "1.0.1.0/24\n")
+                self.assertEqual((ipv6_dir / "CN.txt").read_text(), "240e::/20\n")
+                self.assertFalse((self.dest / "repo" / "other").exists())
+
+    def test_rejects_member_escaping_dest(self):
+        zip_path = self._write_zip({
+            "geo/text/CN.txt": "1.0.1.0/24\n",
+            "geo/text/../../../escaped.txt": "escaped\n",
+        })
+        for module in self.modules:
+            with self.subTest(module=module.__name__):
+                with self.assertRaises(SystemExit):
+                    module._extract_dirs(zip_path, self.dest, "text")
+                self.assertFalse((self.root / "escaped.txt").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
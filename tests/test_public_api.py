@@ -3,6 +3,7 @@ from pathlib import Path
 from unittest.mock import patch
 
 from poptrie import IpSearcher
+from poptrie import ip_searcher
 
 
 class TestPublicApi(unittest.TestCase):
@@ -18,12 +19,14 @@ class TestPublicApi(unittest.TestCase):
         return None
 
     def setUp(self):
+        ip_searcher._SEARCHER_CACHE.clear()
         self.native_patcher = patch(
             "poptrie.ip_searcher._load_native_ip_searcher",
             return_value=self.native_factory,
         )
         self.native_patcher.start()
         self.native_instance = self._build_native_double()
+        self.native_loads = 0
         self.searcher = IpSearcher(self.bin_path)
 
     def _build_native_double(self):
@@ -55,6 +58,7 @@ class TestPublicApi(unittest.TestCase):
 
     def native_factory(self, bin_path):
         self.assertEqual(bin_path, str(self.bin_path))
+        self.native_loads += 1
         return self.native_instance
 
     def tearDown(self):
@@ -63,11 +67,47 @@ class TestPublicApi(unittest.TestCase):
     def test_top_level_facade_module(self):
         self.assertEqual(IpSearcher.__module__, "poptrie.ip_searcher")
 
+    def test_native_searcher_shared_per_file(self):
+        other = IpSearcher(self.bin_path)
+        self.assertIs(other._searcher, self.searcher._searcher)
+        self.assertEqual(self.native_loads, 1)
+
+    def test_native_searcher_shared_through_slotted_handle(self):
+        class SlottedNative:
+            __slots__ = ("contains_ip",)
+
+        ip_searcher._SEARCHER_CACHE.clear()
+        self.native_instance = SlottedNative()
+        self.native_instance.contains_ip = lambda packed_ip: True
+        self.native_loads = 0
+        first = IpSearcher(self.bin_path)
+        second = IpSearcher(self.bin_path)
+        self.assertIs(first._searcher, self.native_instance)
+        self.assertIs(second._searcher, first._searcher)
+        self.assertEqual(self.native_loads, 1)
+        self.assertTrue(second.contains_ip("1.0.1.1"))
+
     def test_facade_contains_ip(self):
         self.assertTrue(self.searcher.contains_ip("1.0.1.1"))
         self.assertTrue(self.searcher.contains_ip("240e::1"))
         self.assertFalse(self.searcher.contains_ip("8.8.8.8"))
 
+    def test_facade_accepts_packed_ip(self):
+        self.assertTrue(self.searcher.contains_ip(b"\x01\x00\x01\x01"))
+        self.assertTrue(self.searcher.contains_ip(bytearray(b"$\x0e" + b"\x00" * 13 + b"\x01")))
+        self.assertEqual(self.searcher.lookup_country(memoryview(b"\x01\x00\x01\x01")), "CN")
+        self.assertFalse(self.searcher.contains_ip(b"\x08\x08\x08\x08"))
+
+    def test_facade_rejects_invalid_ip(self):
+        with self.assertRaises(ValueError):
+            self.searcher.contains_ip(b"\x01\x00\x01")
+        with self.assertRaises(ValueError):
+            self.searcher.contains_ip("not-an-ip")
+        with self.assertRaises(ValueError):
+            self.searcher.contains_ip("1.0.1.1:80")
+        self.assertNotIn("not-an-ip", self.searcher)
+        self.assertIn("1.0.1.1", self.searcher)
+
     def test_facade_lookup_country(self):
         self.assertEqual(self.searcher.lookup_country("1.0.1.1"), "CN")
         self.assertEqual(self.searcher.lookup_country("240e::1"), "CN")
@@ -87,6 +127,45 @@ class TestPublicApi(unittest.TestCase):
         self.assertEqual(self.searcher.lookup_countries(ips), ["CN", None, "US"])
         self.assertEqual(self.searcher.matches_countries(ips, "CN"), [True, False, False])
 
+    def test_facade_batch_lookup_country_codes(self):
+        ips = ["1.0.1.1", "8.8.8.8", "240e::1"]
+        self.assertEqual(
+            self.searcher.lookup_country_codes(ips), [self.CN_CODE, 0, self.US_CODE]
+        )
+        packed = b"\x01\x00\x01\x01\x08\x08\x08\x08"
+        self.assertEqual(self.searcher.lookup_country_codes_packed(packed), [self.CN_CODE, 0])
+
+    def test_facade_batch_reuses_list(self):
+        received = []
+        self.native_instance.contains_strings = lambda ips: received.append(ips) or [True]
+        ips = ["1.0.1.1"]
+        self.searcher.contains_ips(ips)
+        self.searcher.contains_ips(ip for ip in ips)
+        self.assertIs(received[0], ips)
+        self.assertEqual(received[1], ips)
+
+    def test_facade_packed_lookup_countries(self):
+        packed = b"\x01\x00\x01\x01\x08\x08\x08\x08"
+        self.assertEqual(self.searcher.lookup_countries_packed(packed), ["CN", None])
+
+    def test_country_map_contract(self):
+        country_map = self.searcher.country_map
+        self.assertEqual(len(country_map), 26 * 26)
+        self.assertEqual(country_map[self.CN_CODE], "CN")
+        self.assertEqual(country_map.get(self.US_CODE), "US")
+        self.assertIn(self.CN_CODE, country_map)
+        self.assertNotIn(0, country_map)
+        self.assertIsNone(country_map.get((ord("1") << 8) | ord("2")))
+        with self.assertRaises(TypeError):
+            country_map[0] = "XX"
+        self.assertIs(IpSearcher(self.bin_path).country_map, country_map)
+
+    def test_country_table_lookup(self):
+        self.assertEqual(self.searcher._country_from_u16(self.CN_CODE), "CN")
+        self.assertIsNone(self.searcher._country_from_u16(0))
+        self.assertIsNone(self.searcher._country_from_u16((ord("1") << 8) | ord("2")))
+        self.assertIsNone(self.searcher._country_from_u16(0x10000))
+
 
 if __name__ == "__main__":
     unittest.main()